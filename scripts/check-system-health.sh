@@ -157,30 +157,46 @@ echo ""
 echo "3. Checking Network Connectivity"
 echo "--------------------------------"
 
+# Ping both endpoints at once so an outage costs one timeout, not two
+ping -c 1 -W 2 8.8.8.8 &>/dev/null &
+INTERNET_PING_PID=$!
+ping -c 1 -W 2 google.com &>/dev/null &
+DNS_PING_PID=$!
+
 # Check internet connectivity
-if ping -c 1 -W 2 8.8.8.8 &>/dev/null; then
+if wait "$INTERNET_PING_PID"; then
     print_status "OK" "Internet connectivity (8.8.8.8)"
 else
     print_status "ERROR" "No internet connectivity (8.8.8.8)"
 fi
 
 # Check DNS
-if ping -c 1 -W 2 google.com &>/dev/null; then
+if wait "$DNS_PING_PID"; then
     print_status "OK" "DNS resolution (google.com)"
 else
     print_status "ERROR" "DNS resolution failed (google.com)"
 fi
 
-# Check connectivity to other machines
+# Check connectivity to other machines (probed in parallel, reported in order)
 echo ""
 echo "Checking connectivity to other machines..."
+declare -A REACH_PIDS=()
 for machine in $MACHINES; do
     if [ "$machine" = "$CURRENT_HOST" ]; then
         continue
     fi
     
     # Try to resolve hostname
-    if getent hosts "$machine" &>/dev/null || ping -c 1 -W 2 "$machine" &>/dev/null; then
+    { getent hosts "$machine" &>/dev/null || ping -c 1 -W 2 "$machine" &>/dev/null; } &
+    REACH_PIDS[$machine]=$!
+done
+
+for machine in $MACHINES; do
+    if [ -z "${REACH_PIDS[$machine]:-}" ]; then
+        continue
+    fi
+    
+    if wait "${REACH_PIDS[$machine]}"; then
         print_status "OK" "Can reach $machine"
     else
         print_status "WARN" "Cannot reach $machine (may be offline or not on network)"
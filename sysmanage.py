@@ -5,19 +5,25 @@ Fast, beautiful, and easy to navigate system management.
 """
 
 import asyncio
+import functools
+import itertools
 import os
-import subprocess
+import re
+import shutil
 import socket
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 from textual import on, work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
-from textual.containers import Container, Horizontal, Vertical, VerticalScroll
+from textual.containers import Horizontal, Vertical
 from textual.reactive import reactive
-from textual.screen import Screen, ModalScreen
+from textual.screen import ModalScreen
 from textual.widgets import (
     Button,
     Footer,
@@ -25,15 +31,9 @@ from textual.widgets import (
     Label,
     OptionList,
     RichLog,
-    Static,
 )
 from textual.widgets.option_list import Option
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 from rich.text import Text
-from rich.style import Style
-import re
 
 
 # ============================================================================
@@ -41,10 +41,53 @@ import re
 # ============================================================================
 
 DOTFILES_PATH = Path.home() / "dotfiles"
+HEALTH_CHECK_SCRIPT = DOTFILES_PATH / "scripts" / "check-system-health.sh"
 HOSTNAME = socket.gethostname()
 
+# How often streamed command output is flushed to the log (seconds)
+OUTPUT_FLUSH_INTERVAL = 1 / 60
+# Flush early once this many output lines are waiting
+OUTPUT_FLUSH_LINES = 500
+# Bytes requested from a command's output pipe per read
+OUTPUT_READ_SIZE = 65536
+# An unterminated line is shown in pieces once this many bytes are buffered
+OUTPUT_MAX_PARTIAL = OUTPUT_READ_SIZE * 4
+# Scrollback kept per output log; older lines are dropped
+OUTPUT_MAX_LINES = 10000
+
+# Running-command spinner shown in the header, and its frame time (seconds)
+SPINNER_FRAMES = ("⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏")
+SPINNER_INTERVAL = 0.15
+
+# ANSI escape sequences in command output: CSI (group 1 holds the
+# parameters, group 2 the final byte; "m" is SGR colour/style), OSC
+# (window titles, hyperlinks) and two-byte escapes
+ANSI_ESCAPE_RE = re.compile(r'\x1b(?:\[([0-?]*)[ -/]*([@-~])|\][^\x07\x1b]*(?:\x07|\x1b\\)?|[@-Z\\-_])')
+
+# Keywords used to colour command output lines that carry no ANSI codes
+ERROR_LINE_RE = re.compile(r"error|fail(?:ed|ure)|✗", re.IGNORECASE)
+WARNING_LINE_RE = re.compile(r"warn|⚠", re.IGNORECASE)
+SUCCESS_LINE_RE = re.compile(r"success|✓|done|ok ", re.IGNORECASE)
+# Any of the above, so most lines are ruled out with a single search
+KEYWORD_LINE_RE = re.compile(
+    "|".join(r.pattern for r in (ERROR_LINE_RE, WARNING_LINE_RE, SUCCESS_LINE_RE)),
+    re.IGNORECASE,
+)
+HEADER_LINE_PREFIXES = ("===", "---", "╔", "║", "╚")
+
+# Anything outside these characters (quotes, pipes, redirects, $, ;, &&,
+# globs, comments, ...) means a command has to be run through the shell
+SHELL_SYNTAX_RE = re.compile(r"[^\w@%+=:,./ -]")
+
+# Fixed status lines written after a command finishes
+COMMAND_SUCCEEDED = Text("\n✓ Command completed successfully", style="bold green")
+COMMAND_CANCELLED = Text("\n⚠ Command cancelled", style="bold yellow")
+
+# Machines defined in flake.nix
+MACHINES = ("brian-laptop", "superheavy", "backup", "docker")
+
 # NixOS commands
-NIXOS_COMMANDS = {
+NIXOS_COMMANDS = MappingProxyType({
     "switch": f"sudo nixos-rebuild switch --flake {DOTFILES_PATH}#{HOSTNAME}",
     "boot": f"sudo nixos-rebuild boot --flake {DOTFILES_PATH}#{HOSTNAME}",
     "test": f"sudo nixos-rebuild test --flake {DOTFILES_PATH}#{HOSTNAME}",
@@ -52,18 +95,21 @@ NIXOS_COMMANDS = {
     "update": f"cd {DOTFILES_PATH} && nix flake update",
     "gc": "sudo nix-collect-garbage -d",
     "optimise": "sudo nix-store --optimise",
-}
+})
+
+# Docker refresh key presses within this many seconds of the last are ignored
+DOCKER_REFRESH_DEBOUNCE = 0.5
 
 # Docker commands
-DOCKER_COMMANDS = {
+DOCKER_COMMANDS = MappingProxyType({
     "ps": "docker ps -a --format 'table {{.Names}}\t{{.Status}}\t{{.Image}}\t{{.Ports}}'",
     "images": "docker images --format 'table {{.Repository}}\t{{.Tag}}\t{{.Size}}\t{{.CreatedSince}}'",
     "prune": "docker system prune -af",
     "prune_volumes": "docker system prune -af --volumes",
-}
+})
 
 # Log commands
-LOG_COMMANDS = {
+LOG_COMMANDS = MappingProxyType({
     "system": "journalctl -f -n 100",
     "kernel": "journalctl -f -n 100 -k",
     "docker": "journalctl -f -n 100 -u docker",
@@ -71,305 +117,527 @@ LOG_COMMANDS = {
     "sshd": "journalctl -f -n 100 -u sshd",
     "tailscale": "journalctl -f -n 100 -u tailscaled",
     "boot": "journalctl -b -n 200",
-}
+})
 
+# Clipboard tools tried in order: Wayland, then X11
+CLIPBOARD_COMMANDS = (
+    ("wl-copy",),
+    ("xclip", "-selection", "clipboard"),
+)
 
-# ============================================================================
-# Custom CSS
-# ============================================================================
 
-CSS = """
-Screen {
-    background: #0f0f14;
-}
+@dataclass(frozen=True, slots=True)
+class SidebarCommand:
+    """A command button shown in a sidebar section."""
+    id: str
+    label: str
+    variant: str = "info"
+
+
+@dataclass(frozen=True, slots=True)
+class ButtonCommand:
+    """A shell command run by a sidebar button, and where its output goes."""
+    command: str
+    output_id: str
+    title: str
+
+
+@dataclass(frozen=True, slots=True)
+class DockerContainer:
+    """A row of `docker ps` output."""
+    name: str
+    status: str
+    image: str
+    
+    @classmethod
+    def parse(cls, line: str) -> Optional["DockerContainer"]:
+        """Parse a 'name|status|image' line, or return None if malformed."""
+        parts = line.split('|', 2)
+        if len(parts) < 3:
+            return None
+        return cls(*parts)
+
+
+# Rule drawn between groups of sidebar buttons
+SIDEBAR_SEPARATOR = "─" * 18
+
+# Sidebar command buttons per section; None marks a separator
+SIDEBAR_COMMANDS = MappingProxyType({
+    "system": (
+        SidebarCommand("btn-health-run", "Health Check", "success"),
+        SidebarCommand("btn-health-quick", "Quick Check"),
+        SidebarCommand("btn-sys-refresh", "System Info"),
+        SidebarCommand("btn-sys-disk", "Disk Usage"),
+        SidebarCommand("btn-sys-memory", "Memory"),
+        SidebarCommand("btn-sys-network", "Network"),
+        SidebarCommand("btn-sys-processes", "Processes"),
+        None,
+        SidebarCommand("btn-sys-reboot", "Reboot", "warning"),
+        SidebarCommand("btn-sys-shutdown", "Shutdown", "danger"),
+    ),
+    "nixos": (
+        SidebarCommand("btn-nix-switch", "Switch", "success"),
+        SidebarCommand("btn-nix-test", "Test"),
+        SidebarCommand("btn-nix-build", "Build"),
+        SidebarCommand("btn-nix-boot", "Boot", "warning"),
+        None,
+        SidebarCommand("btn-nix-generations", "Generations"),
+        SidebarCommand("btn-nix-machines", "Machines"),
+        None,
+        SidebarCommand("btn-nix-update", "Update Flake"),
+        SidebarCommand("btn-nix-gc", "Garbage Collect", "warning"),
+        SidebarCommand("btn-nix-optimise", "Optimise Store"),
+    ),
+    "docker": (
+        SidebarCommand("btn-docker-refresh", "Refresh"),
+        SidebarCommand("btn-docker-prune", "Prune System", "warning"),
+        SidebarCommand("btn-docker-prune-vol", "Prune+Volumes", "danger"),
+        None,
+        SidebarCommand("btn-container-start", "Start", "success"),
+        SidebarCommand("btn-container-stop", "Stop", "warning"),
+        SidebarCommand("btn-container-restart", "Restart"),
+        SidebarCommand("btn-container-logs", "Logs"),
+        SidebarCommand("btn-container-remove", "Remove", "danger"),
+    ),
+    "logs": (
+        SidebarCommand("btn-log-system", "System"),
+        SidebarCommand("btn-log-kernel", "Kernel"),
+        SidebarCommand("btn-log-docker", "Docker"),
+        SidebarCommand("btn-log-nginx", "Nginx"),
+        SidebarCommand("btn-log-sshd", "SSH"),
+        SidebarCommand("btn-log-tailscale", "Tailscale"),
+        SidebarCommand("btn-log-boot", "Boot"),
+    ),
+    "git": (
+        SidebarCommand("btn-git-status", "Status"),
+        SidebarCommand("btn-git-log", "Log"),
+        SidebarCommand("btn-git-diff", "Diff"),
+        SidebarCommand("btn-git-branches", "Branches"),
+        None,
+        SidebarCommand("btn-git-pull", "Pull", "success"),
+        SidebarCommand("btn-git-push", "Push", "warning"),
+        SidebarCommand("btn-git-fetch", "Fetch"),
+    ),
+    "network": (
+        SidebarCommand("btn-net-interfaces", "Interfaces"),
+        SidebarCommand("btn-net-connections", "Connections"),
+        SidebarCommand("btn-net-ports", "Ports"),
+        SidebarCommand("btn-net-dns", "DNS"),
+        None,
+        SidebarCommand("btn-net-ping", "Ping Google"),
+        SidebarCommand("btn-net-speedtest", "Speedtest", "warning"),
+        SidebarCommand("btn-net-tailscale", "Tailscale"),
+    ),
+    "services": (
+        SidebarCommand("btn-svc-running", "Running"),
+        SidebarCommand("btn-svc-failed", "Failed", "danger"),
+        SidebarCommand("btn-svc-all", "All"),
+        SidebarCommand("btn-svc-timers", "Timers"),
+        None,
+        SidebarCommand("btn-svc-reload", "Reload Daemon", "warning"),
+    ),
+    "storage": (
+        SidebarCommand("btn-stor-df", "Disk Usage"),
+        SidebarCommand("btn-stor-lsblk", "Block Devices"),
+        SidebarCommand("btn-stor-mounts", "Mounts"),
+        SidebarCommand("btn-stor-smart", "SMART Health"),
+        None,
+        SidebarCommand("btn-stor-du", "Largest Dirs"),
+        SidebarCommand("btn-stor-nix", "Nix Store"),
+    ),
+})
+
+# Machine status report, built once at import with the machine list and
+# local hostname filled in
+NIX_MACHINES_SCRIPT = r'''
+echo "══════════════════════════════════════════════════════════════"
+echo "                    NIXOS MACHINES STATUS"
+echo "══════════════════════════════════════════════════════════════"
+echo ""
 
-#main-container {
-    width: 100%;
-    height: 100%;
+# Helper function to get uptime reliably
+get_uptime() {
+    if uptime -p 2>/dev/null; then
+        return 0
+    fi
+    # Fallback: parse /proc/uptime
+    if [ -r /proc/uptime ]; then
+        read -r sec _ < /proc/uptime
+        sec=${sec%%.*}
+        d=$((sec/86400))
+        h=$(((sec%86400)/3600))
+        m=$(((sec%3600)/60))
+        printf "up %d days, %d hours, %d minutes" "$d" "$h" "$m"
+        return 0
+    fi
+    echo "unknown"
 }
 
-/* Top tabs bar */
-#tabs-bar {
-    height: 3;
-    width: 100%;
-    background: #1a1b26;
-    padding: 0 1;
-    align: left middle;
+CURRENT_HOST="@hostname@"
+
+# Everything the report needs from a remote machine, one value per line,
+# so it can all be collected over a single SSH connection
+REMOTE_INFO="$(declare -f get_uptime)"'
+echo "$(nixos-version 2>/dev/null)"
+echo "$(uname -r 2>/dev/null)"
+echo "$(get_uptime 2>/dev/null)"
+echo "$(stat -c %y /run/current-system 2>/dev/null | cut -d. -f1)"
+echo "$(readlink /nix/var/nix/profiles/system 2>/dev/null | grep -oE "[0-9]+" | tail -1)"
+'
+
+# Print the status block for one machine
+report_machine() {
+    local machine="$1"
+    echo "┌─────────────────────────────────────────────────────────────"
+    echo "│ 🖥️  $machine"
+    echo "├─────────────────────────────────────────────────────────────"
+    
+    if [ "$machine" = "$CURRENT_HOST" ]; then
+        VERSION=$(nixos-version 2>/dev/null || echo "unknown")
+        KERNEL=$(uname -r)
+        UPTIME=$(get_uptime)
+        LAST_CHANGE=$(stat -c %y /run/current-system 2>/dev/null | cut -d. -f1 || echo "unknown")
+        GEN=$(readlink /nix/var/nix/profiles/system 2>/dev/null | grep -oE "[0-9]+" | tail -1 || echo "?")
+        
+        echo "│  Status:      ✓ Local (this machine)"
+        echo "│  NixOS:       $VERSION"
+        echo "│  Kernel:      $KERNEL"
+        echo "│  Generation:  $GEN"
+        echo "│  Last Switch: $LAST_CHANGE"
+        echo "│  Uptime:      $UPTIME"
+    else
+        # Try multiple connection methods with fallback
+        REACHABLE=false
+        SSH_AUTH_OK=false
+        MACHINE_TARGET=""
+        SSH_OPTS="-o ConnectTimeout=5 -o StrictHostKeyChecking=no -o BatchMode=yes"
+        
+        # First, find the machine's IP address via multiple methods
+        MACHINE_IP=""
+        HOSTNAME_REACHABLE=false
+        
+        # Check if hostname is reachable via ping (like health check)
+        if ping -c 1 -W 2 "$machine" &>/dev/null 2>&1; then
+            HOSTNAME_REACHABLE=true
+        fi
+        
+        # Method 1: Try to get Tailscale IP
+        if command -v tailscale &>/dev/null; then
+            MACHINE_IP=$(tailscale ip -4 "$machine" 2>/dev/null | head -1)
+        fi
+        
+        # Method 2: Try hostname resolution
+        if [ -z "$MACHINE_IP" ]; then
+            RESOLVED=$(getent hosts "$machine" 2>/dev/null | awk '{print $1}' | head -1)
+            if [ -n "$RESOLVED" ]; then
+                MACHINE_IP="$RESOLVED"
+            fi
+        fi
+        
+        # Check if SSH port is reachable (like health check does)
+        PORT_REACHABLE=false
+        if [ -n "$MACHINE_IP" ]; then
+            if timeout 2 bash -c "echo > /dev/tcp/$MACHINE_IP/22" 2>/dev/null; then
+                PORT_REACHABLE=true
+            fi
+        fi
+        
+        # Now try SSH authentication with different targets
+        # Try hostname first if ping works (even if we don't have IP yet)
+        if [ "$HOSTNAME_REACHABLE" = true ] || [ "$PORT_REACHABLE" = true ] || [ -n "$MACHINE_IP" ]; then
+            # Build list of targets to try, prioritizing hostname if ping works
+            TARGETS=()
+            if [ "$HOSTNAME_REACHABLE" = true ]; then
+                TARGETS+=("brian@$machine" "$machine")
+            fi
+            if [ -n "$MACHINE_IP" ]; then
+                TARGETS+=("brian@$MACHINE_IP" "$MACHINE_IP")
+            fi
+            
+            # Try each target; the first that authenticates also returns the info
+            for target in "${TARGETS[@]}"; do
+                if MACHINE_INFO=$(ssh $SSH_OPTS "$target" "$REMOTE_INFO" 2>/dev/null); then
+                    REACHABLE=true
+                    SSH_AUTH_OK=true
+                    MACHINE_TARGET="$target"
+                    break
+                fi
+            done
+        fi
+        
+        if [ "$SSH_AUTH_OK" = true ]; then
+            # SSH authentication successful - unpack the system info
+            { read -r VERSION; read -r KERNEL; read -r UPTIME; read -r LAST_CHANGE; read -r GEN; } <<< "$MACHINE_INFO"
+            VERSION=${VERSION:-unknown}
+            KERNEL=${KERNEL:-unknown}
+            UPTIME=${UPTIME:-unknown}
+            LAST_CHANGE=${LAST_CHANGE:-unknown}
+            GEN=${GEN:-?}
+            
+            echo "│  Status:      ✓ Online"
+            echo "│  NixOS:       $VERSION"
+            echo "│  Kernel:      $KERNEL"
+            echo "│  Generation:  $GEN"
+            echo "│  Last Switch: $LAST_CHANGE"
+            echo "│  Uptime:      $UPTIME"
+        elif [ "$HOSTNAME_REACHABLE" = true ] || [ "$PORT_REACHABLE" = true ]; then
+            # Machine is reachable but SSH auth failed
+            echo "│  Status:      ⚠ Reachable but SSH auth failed"
+            echo "│  Note:        Machine is online but SSH keys not configured"
+            if [ "$HOSTNAME_REACHABLE" = true ]; then
+                echo "│  Network:     Hostname ping works"
+            fi
+            if [ -n "$MACHINE_IP" ]; then
+                echo "│  IP:          $MACHINE_IP"
+            fi
+        else
+            # Can't reach machine at all
+            echo "│  Status:      ✗ Offline or unreachable"
+            if [ -n "$MACHINE_IP" ]; then
+                echo "│  IP:          $MACHINE_IP (but SSH port not reachable)"
+            fi
+        fi
+    fi
+    echo "└─────────────────────────────────────────────────────────────"
+    echo ""
 }
 
-.tab {
-    width: auto;
-    min-width: 12;
-    height: 3;
-    margin: 0;
-    padding: 0 1;
-    border: none;
-    background: #1a1b26;
-    color: #565f89;
-    text-style: none;
-}
+# Probe every machine at once (each can spend seconds in ping/SSH
+# timeouts), then print the reports in a stable order
+REPORT_DIR=$(mktemp -d)
+trap 'rm -rf "$REPORT_DIR"' EXIT
 
-.tab:hover {
-    color: #a9b1d6;
-    background: #1a1b26;
-    text-style: none;
-    border: none;
-}
+for machine in @machines@; do
+    report_machine "$machine" > "$REPORT_DIR/$machine" 2>&1 &
+done
+wait
 
-.tab:focus {
-    text-style: none;
-    background: #1a1b26;
-    border: none;
+for machine in @machines@; do
+    cat "$REPORT_DIR/$machine"
+done
+'''.replace("@machines@", " ".join(MACHINES)).replace("@hostname@", HOSTNAME)
+
+# SMART health of every disk, probed in parallel
+SMART_STATUS_SCRIPT = r'''
+# Print the SMART health verdict for one disk
+report_disk() {
+    local disk="$1"
+    # ATA/NVMe report "self-assessment test result: X", SCSI "Health Status: X"
+    VERDICT=$(timeout 10 sudo smartctl -H "/dev/$disk" 2>/dev/null |
+        sed -n -e 's/.*self-assessment test result: *//p' -e 's/^SMART Health Status: *//p')
+    case "$VERDICT" in
+        PASSED|OK) echo "✓ /dev/$disk: $VERDICT" ;;
+        "") echo "  /dev/$disk: SMART not available" ;;
+        *) echo "✗ /dev/$disk: $VERDICT" ;;
+    esac
 }
 
-.tab.-active {
-    text-style: none;
-    background: #1a1b26;
-    border: none;
-}
+# Whole disks only; read splits the columns without forking awk
+DISKS=$(lsblk -dn -o NAME,TYPE | while read -r name type; do
+    if [ "$type" = "disk" ]; then
+        echo "$name"
+    fi
+done)
 
-.tab.active {
-    color: #7aa2f7;
-    text-style: none;
-    background: #1a1b26;
-    border: none;
-}
+# Authenticate once so the parallel probes don't each ask for a password
+sudo -v 2>/dev/null
 
-.tab.active:hover {
-    color: #7aa2f7;
-    text-style: none;
-    background: #1a1b26;
-    border: none;
-}
+# A sleeping or slow drive can take seconds to answer, so query every disk
+# at once, then print the reports in lsblk order
+REPORT_DIR=$(mktemp -d)
+trap 'rm -rf "$REPORT_DIR"' EXIT
 
-.tab.active:focus {
-    color: #7aa2f7;
-    text-style: none;
-    background: #1a1b26;
-    border: none;
-}
+for disk in $DISKS; do
+    report_disk "$disk" > "$REPORT_DIR/$disk" 2>&1 &
+done
+wait
 
-.tab:disabled {
-    text-style: none;
-    background: #1a1b26;
-    border: none;
-}
+for disk in $DISKS; do
+    cat "$REPORT_DIR/$disk"
+done
+echo ""
 
-.tab.-pressed {
-    text-style: none;
-    background: #1a1b26;
-    border: none;
-}
+lsblk -d -o NAME,MODEL,SIZE
+'''
 
-.tab.active.-pressed {
-    color: #7aa2f7;
-    text-style: none;
-    background: #1a1b26;
-    border: none;
-}
+# Shell reports run from the System section
+QUICK_HEALTH_SCRIPT = f"""
+echo "=== Quick Health Check ==="
+echo ""
+echo "📍 Hostname: {HOSTNAME}"
+echo "🕐 Uptime: $(uptime -p)"
+echo ""
+echo "=== Services ==="
+systemctl is-active --quiet docker && echo "✓ Docker: Running" || echo "✗ Docker: Not running"
+systemctl is-active --quiet sshd && echo "✓ SSH: Running" || echo "✗ SSH: Not running"
+systemctl is-active --quiet tailscaled && echo "✓ Tailscale: Running" || echo "✗ Tailscale: Not running"
+systemctl is-active --quiet NetworkManager && echo "✓ NetworkManager: Running" || echo "✗ NetworkManager: Not running"
+echo ""
+echo "=== Disk Space ==="
+df -h / /home /nix 2>/dev/null | tail -n +2
+echo ""
+echo "=== Memory ==="
+free -h | head -2
+echo ""
+echo "=== Failed Services ==="
+systemctl list-units --state=failed --no-legend | head -5 || echo "None"
+"""
 
-/* Content wrapper */
-#content-wrapper {
-    height: 1fr;
-}
+SYSTEM_INFO_SCRIPT = f"""
+echo "╔══════════════════════════════════════════════════════════════╗"
+echo "║               SYSTEM INFORMATION                              ║"
+echo "╚══════════════════════════════════════════════════════════════╝"
+echo ""
+echo "🖥️  Hostname: {HOSTNAME}"
+echo "🐧 Kernel: {os.uname().release}"
+echo "⏱️  Uptime: $(uptime -p)"
+echo "📅 Date: $(date)"
+echo ""
+echo "═══════════════════════ CPU ═══════════════════════"
+lscpu | grep -E "Model name|CPU\\(s\\)|Thread|Core|MHz" | head -5
+echo ""
+echo "═══════════════════════ MEMORY ═══════════════════════"
+free -h
+echo ""
+echo "═══════════════════════ DISK ═══════════════════════"
+df -h | grep -E "^/dev|Filesystem"
+echo ""
+echo "═══════════════════════ NIXOS ═══════════════════════"
+nixos-version 2>/dev/null || echo "Not a NixOS system"
+echo "Flake: {DOTFILES_PATH}"
+echo ""
+echo "═══════════════════════ NETWORK ═══════════════════════"
+ip -brief addr | grep -v "^lo"
+"""
 
-/* Sidebar with commands */
-#sidebar {
-    width: 22;
-    background: #16161e;
-    border-right: wide #292e42;
-    padding: 1;
-    padding-right: 0;
-}
+SYSTEM_DISK_SCRIPT = """
+echo "═══════════════════════ DISK USAGE ═══════════════════════"
+echo ""
+df -h
+echo ""
+echo "═══════════════════════ LARGEST DIRECTORIES ═══════════════════════"
+echo ""
+du -sh /nix/store 2>/dev/null || true
+du -sh /home/* 2>/dev/null | sort -rh | head -10
+echo ""
+echo "═══════════════════════ NIX STORE ═══════════════════════"
+nix-store --gc --print-dead 2>/dev/null | wc -l | xargs echo "Dead paths:"
+"""
 
-#sidebar-title {
-    text-style: bold;
-    color: #7aa2f7;
-    padding-bottom: 1;
-    border-bottom: solid #292e42;
-    margin-bottom: 1;
-    text-align: center;
-}
+SYSTEM_MEMORY_SCRIPT = """
+echo "═══════════════════════ MEMORY USAGE ═══════════════════════"
+echo ""
+free -h
+echo ""
+echo "═══════════════════════ TOP MEMORY CONSUMERS ═══════════════════════"
+echo ""
+ps aux --sort=-%mem | head -15
+"""
 
-/* Sidebar buttons */
-#sidebar Button {
-    width: 100%;
-    height: 3;
-    margin-bottom: 1;
-    border: none;
-}
+SYSTEM_NETWORK_SCRIPT = """
+echo "═══════════════════════ NETWORK INTERFACES ═══════════════════════"
+echo ""
+ip -brief addr
+echo ""
+echo "═══════════════════════ ROUTING TABLE ═══════════════════════"
+echo ""
+ip route
+echo ""
+echo "═══════════════════════ TAILSCALE STATUS ═══════════════════════"
+echo ""
+tailscale status 2>/dev/null || echo "Tailscale not available"
+echo ""
+echo "═══════════════════════ LISTENING PORTS ═══════════════════════"
+echo ""
+ss -tlnp 2>/dev/null | head -20
+"""
 
-#sidebar .cmd-success {
-    background: #9ece6a;
-    color: #0f0f14;
-}
+SYSTEM_PROCESSES_SCRIPT = """
+echo "═══════════════════════ TOP PROCESSES (CPU) ═══════════════════════"
+echo ""
+ps aux --sort=-%cpu | head -15
+echo ""
+echo "═══════════════════════ SYSTEMD SERVICES ═══════════════════════"
+echo ""
+systemctl list-units --type=service --state=running | head -20
+"""
 
-#sidebar .cmd-success:hover {
-    background: #b9f27c;
-}
+# Sidebar buttons that just run a shell command
+BUTTON_COMMANDS = MappingProxyType({
+    "btn-health-quick": ButtonCommand(QUICK_HEALTH_SCRIPT, "system-output", "Quick Health Check"),
+    "btn-sys-refresh": ButtonCommand(SYSTEM_INFO_SCRIPT, "system-output", "System Information"),
+    "btn-sys-disk": ButtonCommand(SYSTEM_DISK_SCRIPT, "system-output", "Disk Usage"),
+    "btn-sys-memory": ButtonCommand(SYSTEM_MEMORY_SCRIPT, "system-output", "Memory Usage"),
+    "btn-sys-network": ButtonCommand(SYSTEM_NETWORK_SCRIPT, "system-output", "Network Info"),
+    "btn-sys-processes": ButtonCommand(SYSTEM_PROCESSES_SCRIPT, "system-output", "Processes"),
+    "btn-nix-switch": ButtonCommand(NIXOS_COMMANDS["switch"], "nixos-output", "NixOS Rebuild Switch"),
+    "btn-nix-test": ButtonCommand(NIXOS_COMMANDS["test"], "nixos-output", "NixOS Rebuild Test"),
+    "btn-nix-build": ButtonCommand(NIXOS_COMMANDS["build"], "nixos-output", "NixOS Rebuild Build"),
+    "btn-nix-boot": ButtonCommand(NIXOS_COMMANDS["boot"], "nixos-output", "NixOS Rebuild Boot"),
+    "btn-nix-update": ButtonCommand(NIXOS_COMMANDS["update"], "nixos-output", "Update Flake Inputs"),
+    "btn-nix-optimise": ButtonCommand(NIXOS_COMMANDS["optimise"], "nixos-output", "Optimise Nix Store"),
+    "btn-nix-machines": ButtonCommand(NIX_MACHINES_SCRIPT, "nixos-output", "NixOS Machines"),
+    "btn-log-system": ButtonCommand(LOG_COMMANDS["system"], "log-output", "System Logs"),
+    "btn-log-kernel": ButtonCommand(LOG_COMMANDS["kernel"], "log-output", "Kernel Logs"),
+    "btn-log-docker": ButtonCommand(LOG_COMMANDS["docker"], "log-output", "Docker Logs"),
+    "btn-log-nginx": ButtonCommand(LOG_COMMANDS["nginx"], "log-output", "Nginx Logs"),
+    "btn-log-sshd": ButtonCommand(LOG_COMMANDS["sshd"], "log-output", "SSH Logs"),
+    "btn-log-tailscale": ButtonCommand(LOG_COMMANDS["tailscale"], "log-output", "Tailscale Logs"),
+    "btn-log-boot": ButtonCommand(LOG_COMMANDS["boot"], "log-output", "Boot Logs"),
+    "btn-git-status": ButtonCommand(f"cd {DOTFILES_PATH} && git status", "git-output", "Git Status"),
+    "btn-git-log": ButtonCommand(f"cd {DOTFILES_PATH} && git log --oneline --graph -20", "git-output", "Git Log"),
+    "btn-git-diff": ButtonCommand(f"cd {DOTFILES_PATH} && git diff", "git-output", "Git Diff"),
+    "btn-git-branches": ButtonCommand(f"cd {DOTFILES_PATH} && git branch -a", "git-output", "Git Branches"),
+    "btn-git-pull": ButtonCommand(f"cd {DOTFILES_PATH} && git pull", "git-output", "Git Pull"),
+    "btn-git-push": ButtonCommand(f"cd {DOTFILES_PATH} && git push", "git-output", "Git Push"),
+    "btn-git-fetch": ButtonCommand(f"cd {DOTFILES_PATH} && git fetch --all", "git-output", "Git Fetch"),
+    "btn-net-interfaces": ButtonCommand("ip -c addr", "network-output", "Network Interfaces"),
+    "btn-net-connections": ButtonCommand("ss -tunapl 2>/dev/null | head -50", "network-output", "Active Connections"),
+    "btn-net-ports": ButtonCommand("ss -tlnp", "network-output", "Listening Ports"),
+    "btn-net-dns": ButtonCommand("cat /etc/resolv.conf && echo '' && resolvectl status 2>/dev/null | head -30", "network-output", "DNS Configuration"),
+    "btn-net-ping": ButtonCommand("ping -c 5 8.8.8.8 && ping -c 5 google.com", "network-output", "Ping Test"),
+    "btn-net-speedtest": ButtonCommand("speedtest-cli --simple", "network-output", "Speed Test"),
+    "btn-net-tailscale": ButtonCommand("tailscale status && echo '' && tailscale ip", "network-output", "Tailscale Status"),
+    "btn-svc-running": ButtonCommand("systemctl list-units --type=service --state=running", "services-output", "Running Services"),
+    "btn-svc-failed": ButtonCommand("systemctl list-units --state=failed", "services-output", "Failed Services"),
+    "btn-svc-all": ButtonCommand("systemctl list-units --type=service", "services-output", "All Services"),
+    "btn-svc-timers": ButtonCommand("systemctl list-timers --all", "services-output", "Timers"),
+    "btn-svc-reload": ButtonCommand("sudo systemctl daemon-reload", "services-output", "Daemon Reload"),
+    "btn-stor-df": ButtonCommand("df -h", "storage-output", "Disk Usage"),
+    "btn-stor-lsblk": ButtonCommand("lsblk -o NAME,SIZE,TYPE,FSTYPE,MOUNTPOINT,LABEL", "storage-output", "Block Devices"),
+    "btn-stor-mounts": ButtonCommand("findmnt -t notmpfs,nosquashfs,nodevtmpfs", "storage-output", "Mount Points"),
+    "btn-stor-smart": ButtonCommand(SMART_STATUS_SCRIPT, "storage-output", "SMART Health"),
+    "btn-stor-du": ButtonCommand("du -sh /home/* 2>/dev/null | sort -rh | head -15", "storage-output", "Largest Directories"),
+    "btn-stor-nix": ButtonCommand("du -sh /nix/store && nix-store --gc --print-dead 2>/dev/null | wc -l | xargs -I{} echo 'Dead paths: {}'", "storage-output", "Nix Store"),
+})
+
+# Docker buttons that act on the selected container: (command, title) templates
+CONTAINER_COMMANDS = MappingProxyType({
+    "btn-container-start": ("docker start {container}", "Starting {container}"),
+    "btn-container-stop": ("docker stop {container}", "Stopping {container}"),
+    "btn-container-restart": ("docker restart {container}", "Restarting {container}"),
+    "btn-container-logs": ("docker logs -f --tail 100 {container}", "Logs: {container}"),
+})
 
-#sidebar .cmd-info {
-    background: #7aa2f7;
-    color: #0f0f14;
-}
 
-#sidebar .cmd-info:hover {
-    background: #a9c4ff;
-}
+# ============================================================================
+# Helpers
+# ============================================================================
 
-#sidebar .cmd-warning {
-    background: #e0af68;
-    color: #0f0f14;
-}
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """Full path of a program on PATH (looked up once), or None."""
+    return shutil.which(name)
 
-#sidebar .cmd-warning:hover {
-    background: #ffc777;
-}
 
-#sidebar .cmd-danger {
-    background: #f7768e;
-    color: #0f0f14;
-}
+def resolve_program(name: str) -> str:
+    """Full path of a program on PATH, or name if not found."""
+    return _which(name) or name
 
-#sidebar .cmd-danger:hover {
-    background: #ff9e9e;
-}
 
-#sidebar Button:focus {
-    text-style: bold reverse;
-}
-
-.sidebar-section {
-    display: none;
-    height: auto;
-}
-
-.sidebar-section.visible {
-    display: block;
-}
-
-.section-label {
-    color: #565f89;
-    padding: 1 0;
-    text-align: center;
-}
-
-/* Content wrapper with clear separation */
-#content-wrapper {
-    overflow: hidden;
-}
-
-/* Main output area - better isolated for text selection */
-#output-area {
-    width: 1fr;
-    height: 100%;
-    padding: 1;
-    padding-left: 1;
-    background: #0f0f14;
-}
-
-/* RichLog output panels - enable text selection */
-RichLog {
-    height: 1fr;
-    border: round #292e42;
-    background: #16161e;
-    padding: 1;
-    scrollbar-background: #16161e;
-    scrollbar-color: #3d59a1;
-    scrollbar-color-hover: #7aa2f7;
-    scrollbar-color-active: #7aa2f7;
-    /* Text selection is handled by the terminal - use Ctrl+C to copy all output */
-}
-
-.output-panel {
-    display: none;
-    height: 100%;
-}
-
-.output-panel.visible {
-    display: block;
-}
-
-/* Option list for docker containers */
-#docker-containers {
-    height: 10;
-    border: round #292e42;
-    background: #16161e;
-    margin-bottom: 1;
-}
-
-#docker-containers:focus {
-    border: round #7aa2f7;
-}
-
-#docker-containers > .option-list--option {
-    padding: 0 1;
-}
-
-#docker-containers > .option-list--option-highlighted {
-    background: #292e42;
-}
-
-/* Confirmation dialog */
-ConfirmDialog {
-    align: center middle;
-}
-
-#confirm-container {
-    width: 60;
-    height: auto;
-    background: #16161e;
-    border: round #f7768e;
-    padding: 1 2;
-}
-
-#confirm-title {
-    text-style: bold;
-    color: #f7768e;
-    text-align: center;
-    padding-bottom: 1;
-    border-bottom: solid #292e42;
-    width: 100%;
-}
-
-#confirm-message {
-    padding: 1 0;
-    text-align: center;
-    color: #c0caf5;
-    width: 1fr;
-    text-wrap: wrap;
-}
-
-#confirm-buttons {
-    padding-top: 1;
-    align: center middle;
-}
-
-#confirm-buttons Button {
-    margin: 0 1;
-    min-width: 12;
-}
-
-/* Header styling */
-Header {
-    background: #16161e;
-    color: #7aa2f7;
-}
-
-/* Footer styling */
-Footer {
-    background: #16161e;
-}
-
-Footer > .footer--key {
-    background: #3d59a1;
-    color: #c0caf5;
-}
-
-Footer > .footer--description {
-    color: #565f89;
-}
-"""
+def _docker_cli_installed() -> bool:
+    """Whether the docker CLI is on PATH."""
+    return _which("docker") is not None
 
 
 # ============================================================================
@@ -420,21 +688,18 @@ class SysManage(App):
     """TUI System Management Application."""
     
     TITLE = "SysManage"
-    CSS = CSS
+    CSS_PATH = "sysmanage.tcss"
     ENABLE_COMMAND_PALETTE = False
     ALLOW_SELECT = True
     
+    TABS = ("system", "nixos", "docker", "logs", "git", "network", "services", "storage")
+    TAB_INDEX = {section: idx for idx, section in enumerate(TABS)}
+    TAB_BUTTON_SECTIONS = {f"tab-{section}": section for section in TABS}
+    
     BINDINGS = [
         Binding("q", "quit", "Quit", show=True),
         Binding("escape", "quit", "Quit", show=False),
-        Binding("1", "show_system", "1", show=False),
-        Binding("2", "show_nixos", "2", show=False),
-        Binding("3", "show_docker", "3", show=False),
-        Binding("4", "show_logs", "4", show=False),
-        Binding("5", "show_git", "5", show=False),
-        Binding("6", "show_network", "6", show=False),
-        Binding("7", "show_services", "7", show=False),
-        Binding("8", "show_storage", "8", show=False),
+        *[Binding(str(key), f"show_section('{section}')", str(key), show=False) for key, section in enumerate(TABS, 1)],
         Binding("left", "prev_tab", "←", show=True),
         Binding("right", "next_tab", "→", show=True),
         Binding("up", "prev_cmd", "↑", show=False),
@@ -445,12 +710,13 @@ class SysManage(App):
         Binding("ctrl+c", "copy_output", "^C Copy", show=True),
     ]
     
-    current_section = reactive("system")
+    # compose() already shows the system section, so skip the initial watch
+    current_section = reactive("system", init=False)
     running_process: Optional[asyncio.subprocess.Process] = None
-    spinner_task: Optional[asyncio.Task] = None
-    is_running = reactive(False)
-    
-    TABS = ["system", "nixos", "docker", "logs", "git", "network", "services", "storage"]
+    _pending_focus_index: Optional[int] = None
+    _pending_focus_section: Optional[str] = None
+    _docker_containers: Optional[list] = None
+    _docker_refreshed_at: float = float("-inf")
     
     def compose(self) -> ComposeResult:
         yield Header()
@@ -473,110 +739,36 @@ class SysManage(App):
                 with Vertical(id="sidebar"):
                     yield Label("Commands", id="sidebar-title")
                     
-                    # System commands
-                    with Vertical(id="sidebar-system", classes="sidebar-section visible"):
-                        yield Button("Health Check", id="btn-health-run", classes="cmd-success")
-                        yield Button("Quick Check", id="btn-health-quick", classes="cmd-info")
-                        yield Button("System Info", id="btn-sys-refresh", classes="cmd-info")
-                        yield Button("Disk Usage", id="btn-sys-disk", classes="cmd-info")
-                        yield Button("Memory", id="btn-sys-memory", classes="cmd-info")
-                        yield Button("Network", id="btn-sys-network", classes="cmd-info")
-                        yield Button("Processes", id="btn-sys-processes", classes="cmd-info")
-                        yield Label("─" * 18, classes="section-label")
-                        yield Button("Reboot", id="btn-sys-reboot", classes="cmd-warning")
-                        yield Button("Shutdown", id="btn-sys-shutdown", classes="cmd-danger")
-                    
-                    # NixOS commands
-                    with Vertical(id="sidebar-nixos", classes="sidebar-section"):
-                        yield Button("Switch", id="btn-nix-switch", classes="cmd-success")
-                        yield Button("Test", id="btn-nix-test", classes="cmd-info")
-                        yield Button("Build", id="btn-nix-build", classes="cmd-info")
-                        yield Button("Boot", id="btn-nix-boot", classes="cmd-warning")
-                        yield Label("─" * 18, classes="section-label")
-                        yield Button("Generations", id="btn-nix-generations", classes="cmd-info")
-                        yield Button("Machines", id="btn-nix-machines", classes="cmd-info")
-                        yield Label("─" * 18, classes="section-label")
-                        yield Button("Update Flake", id="btn-nix-update", classes="cmd-info")
-                        yield Button("Garbage Collect", id="btn-nix-gc", classes="cmd-warning")
-                        yield Button("Optimise Store", id="btn-nix-optimise", classes="cmd-info")
-                    
-                    # Docker commands
-                    with Vertical(id="sidebar-docker", classes="sidebar-section"):
-                        yield Button("Refresh", id="btn-docker-refresh", classes="cmd-info")
-                        yield Button("Prune System", id="btn-docker-prune", classes="cmd-warning")
-                        yield Button("Prune+Volumes", id="btn-docker-prune-vol", classes="cmd-danger")
-                        yield Label("─" * 18, classes="section-label")
-                        yield Button("Start", id="btn-container-start", classes="cmd-success")
-                        yield Button("Stop", id="btn-container-stop", classes="cmd-warning")
-                        yield Button("Restart", id="btn-container-restart", classes="cmd-info")
-                        yield Button("Logs", id="btn-container-logs", classes="cmd-info")
-                        yield Button("Remove", id="btn-container-remove", classes="cmd-danger")
-                    
-                    # Logs commands
-                    with Vertical(id="sidebar-logs", classes="sidebar-section"):
-                        yield Button("System", id="btn-log-system", classes="cmd-info")
-                        yield Button("Kernel", id="btn-log-kernel", classes="cmd-info")
-                        yield Button("Docker", id="btn-log-docker", classes="cmd-info")
-                        yield Button("Nginx", id="btn-log-nginx", classes="cmd-info")
-                        yield Button("SSH", id="btn-log-sshd", classes="cmd-info")
-                        yield Button("Tailscale", id="btn-log-tailscale", classes="cmd-info")
-                        yield Button("Boot", id="btn-log-boot", classes="cmd-info")
-                    
-                    # Git commands
-                    with Vertical(id="sidebar-git", classes="sidebar-section"):
-                        yield Button("Status", id="btn-git-status", classes="cmd-info")
-                        yield Button("Log", id="btn-git-log", classes="cmd-info")
-                        yield Button("Diff", id="btn-git-diff", classes="cmd-info")
-                        yield Button("Branches", id="btn-git-branches", classes="cmd-info")
-                        yield Label("─" * 18, classes="section-label")
-                        yield Button("Pull", id="btn-git-pull", classes="cmd-success")
-                        yield Button("Push", id="btn-git-push", classes="cmd-warning")
-                        yield Button("Fetch", id="btn-git-fetch", classes="cmd-info")
-                    
-                    # Network commands
-                    with Vertical(id="sidebar-network", classes="sidebar-section"):
-                        yield Button("Interfaces", id="btn-net-interfaces", classes="cmd-info")
-                        yield Button("Connections", id="btn-net-connections", classes="cmd-info")
-                        yield Button("Ports", id="btn-net-ports", classes="cmd-info")
-                        yield Button("DNS", id="btn-net-dns", classes="cmd-info")
-                        yield Label("─" * 18, classes="section-label")
-                        yield Button("Ping Google", id="btn-net-ping", classes="cmd-info")
-                        yield Button("Speedtest", id="btn-net-speedtest", classes="cmd-warning")
-                        yield Button("Tailscale", id="btn-net-tailscale", classes="cmd-info")
-                    
-                    # Services commands
-                    with Vertical(id="sidebar-services", classes="sidebar-section"):
-                        yield Button("Running", id="btn-svc-running", classes="cmd-info")
-                        yield Button("Failed", id="btn-svc-failed", classes="cmd-danger")
-                        yield Button("All", id="btn-svc-all", classes="cmd-info")
-                        yield Button("Timers", id="btn-svc-timers", classes="cmd-info")
-                        yield Label("─" * 18, classes="section-label")
-                        yield Button("Reload Daemon", id="btn-svc-reload", classes="cmd-warning")
-                    
-                    # Storage commands
-                    with Vertical(id="sidebar-storage", classes="sidebar-section"):
-                        yield Button("Disk Usage", id="btn-stor-df", classes="cmd-info")
-                        yield Button("Block Devices", id="btn-stor-lsblk", classes="cmd-info")
-                        yield Button("Mounts", id="btn-stor-mounts", classes="cmd-info")
-                        yield Button("SMART Health", id="btn-stor-smart", classes="cmd-info")
-                        yield Label("─" * 18, classes="section-label")
-                        yield Button("Largest Dirs", id="btn-stor-du", classes="cmd-info")
-                        yield Button("Nix Store", id="btn-stor-nix", classes="cmd-info")
+                    # Keep the buttons per section for keyboard navigation
+                    self._section_buttons: dict[str, list[Button]] = {}
+                    self._button_index: dict[str, int] = {}
+                    for section in self.TABS:
+                        buttons = self._section_buttons[section] = []
+                        classes = "sidebar-section visible" if section == "system" else "sidebar-section"
+                        with Vertical(id=f"sidebar-{section}", classes=classes):
+                            for command in SIDEBAR_COMMANDS[section]:
+                                if command is None:
+                                    yield Label(SIDEBAR_SEPARATOR, classes="section-label")
+                                else:
+                                    button = Button(command.label, id=command.id, classes=f"cmd-{command.variant}")
+                                    self._button_index[command.id] = len(buttons)
+                                    buttons.append(button)
+                                    yield button
                 
                 # Main output area
                 with Vertical(id="output-area"):
                     # System output
                     with Vertical(id="output-system", classes="output-panel visible"):
-                        yield RichLog(id="system-output", highlight=True, markup=True)
+                        yield RichLog(id="system-output", highlight=True, markup=True, max_lines=OUTPUT_MAX_LINES)
                     
                     # NixOS output
                     with Vertical(id="output-nixos", classes="output-panel"):
-                        yield RichLog(id="nixos-output", highlight=True, markup=True)
+                        yield RichLog(id="nixos-output", highlight=True, markup=True, max_lines=OUTPUT_MAX_LINES)
                     
                     # Docker output
                     with Vertical(id="output-docker", classes="output-panel"):
                         yield OptionList(id="docker-containers")
-                        yield RichLog(id="docker-output", highlight=True, markup=True)
+                        yield RichLog(id="docker-output", highlight=True, markup=True, max_lines=OUTPUT_MAX_LINES)
                     
                     # Logs output
                     with Vertical(id="output-logs", classes="output-panel"):
@@ -584,19 +776,19 @@ class SysManage(App):
                     
                     # Git output
                     with Vertical(id="output-git", classes="output-panel"):
-                        yield RichLog(id="git-output", highlight=True, markup=True)
+                        yield RichLog(id="git-output", highlight=True, markup=True, max_lines=OUTPUT_MAX_LINES)
                     
                     # Network output
                     with Vertical(id="output-network", classes="output-panel"):
-                        yield RichLog(id="network-output", highlight=True, markup=True)
+                        yield RichLog(id="network-output", highlight=True, markup=True, max_lines=OUTPUT_MAX_LINES)
                     
                     # Services output
                     with Vertical(id="output-services", classes="output-panel"):
-                        yield RichLog(id="services-output", highlight=True, markup=True)
+                        yield RichLog(id="services-output", highlight=True, markup=True, max_lines=OUTPUT_MAX_LINES)
                     
                     # Storage output
                     with Vertical(id="output-storage", classes="output-panel"):
-                        yield RichLog(id="storage-output", highlight=True, markup=True)
+                        yield RichLog(id="storage-output", highlight=True, markup=True, max_lines=OUTPUT_MAX_LINES)
         
         yield Footer()
     
@@ -604,164 +796,130 @@ class SysManage(App):
         """Initialize the app."""
         self.title = f"SysManage - {HOSTNAME}"
         self.sub_title = datetime.now().strftime("%Y-%m-%d %H:%M")
+        # Widgets never change after compose; look them up once
+        self._output_logs = {log.id: log for log in self.query(RichLog)}
+        self._tab_buttons = {section: self.query_one(f"#tab-{section}") for section in self.TABS}
+        self._sidebar_sections = {section: self.query_one(f"#sidebar-{section}") for section in self.TABS}
+        self._output_panels = {section: self.query_one(f"#output-{section}") for section in self.TABS}
+        self._section_logs = {section: panel.query_one(RichLog) for section, panel in self._output_panels.items()}
+        self._docker_list = self.query_one("#docker-containers", OptionList)
+    
+    def on_unmount(self) -> None:
+        """Stop a still-running command so it does not outlive the app."""
+        if self.running_process and self.running_process.returncode is None:
+            try:
+                self.running_process.terminate()
+            except ProcessLookupError:
+                pass
     
     # ========================================================================
     # Section Navigation
     # ========================================================================
     
-    def watch_current_section(self, section: str) -> None:
+    def watch_current_section(self, old_section: str, section: str) -> None:
         """Update visible section when current_section changes."""
-        # Update tab buttons
-        for tab in self.query(".tab"):
-            tab.remove_class("active")
-        try:
-            self.query_one(f"#tab-{section}").add_class("active")
-        except Exception:
-            pass
+        # Only the outgoing and incoming sections change state
+        self._tab_buttons[old_section].remove_class("active")
+        self._tab_buttons[section].add_class("active")
         
-        # Update sidebar sections
-        for sidebar in self.query(".sidebar-section"):
-            sidebar.remove_class("visible")
-        try:
-            self.query_one(f"#sidebar-{section}").add_class("visible")
-        except Exception:
-            pass
+        self._sidebar_sections[old_section].remove_class("visible")
+        self._sidebar_sections[section].add_class("visible")
         
-        # Update output panels
-        for panel in self.query(".output-panel"):
-            panel.remove_class("visible")
-        try:
-            self.query_one(f"#output-{section}").add_class("visible")
-        except Exception:
-            pass
-    
-    @on(Button.Pressed, "#tab-system")
-    def tab_system(self) -> None:
-        self.current_section = "system"
-    
-    @on(Button.Pressed, "#tab-nixos")
-    def tab_nixos(self) -> None:
-        self.current_section = "nixos"
-    
-    @on(Button.Pressed, "#tab-docker")
-    def tab_docker(self) -> None:
-        self.current_section = "docker"
-    
-    @on(Button.Pressed, "#tab-logs")
-    def tab_logs(self) -> None:
-        self.current_section = "logs"
-    
-    @on(Button.Pressed, "#tab-git")
-    def tab_git(self) -> None:
-        self.current_section = "git"
-    
-    @on(Button.Pressed, "#tab-network")
-    def tab_network(self) -> None:
-        self.current_section = "network"
-    
-    @on(Button.Pressed, "#tab-services")
-    def tab_services(self) -> None:
-        self.current_section = "services"
-    
-    @on(Button.Pressed, "#tab-storage")
-    def tab_storage(self) -> None:
-        self.current_section = "storage"
-    
-    def action_show_system(self) -> None:
-        self.current_section = "system"
-        self._focus_first_command()
-    
-    def action_show_nixos(self) -> None:
-        self.current_section = "nixos"
-        self._focus_first_command()
-    
-    def action_show_docker(self) -> None:
-        self.current_section = "docker"
-        self._focus_first_command()
-    
-    def action_show_logs(self) -> None:
-        self.current_section = "logs"
-        self._focus_first_command()
-    
-    def action_show_git(self) -> None:
-        self.current_section = "git"
-        self._focus_first_command()
+        self._output_panels[old_section].remove_class("visible")
+        self._output_panels[section].add_class("visible")
+        
+        # A move queued for the old section's buttons no longer applies
+        self._pending_focus_index = None
     
-    def action_show_network(self) -> None:
-        self.current_section = "network"
-        self._focus_first_command()
+    @on(Button.Pressed, ".tab")
+    def tab_pressed(self, event: Button.Pressed) -> None:
+        """Switch to the section of the pressed tab button."""
+        self.current_section = self.TAB_BUTTON_SECTIONS[event.button.id]
     
-    def action_show_services(self) -> None:
-        self.current_section = "services"
-        self._focus_first_command()
-    
-    def action_show_storage(self) -> None:
-        self.current_section = "storage"
+    def action_show_section(self, section: str) -> None:
+        """Switch to a section and focus its first command."""
+        self.current_section = section
         self._focus_first_command()
     
     def action_prev_tab(self) -> None:
         """Move to previous tab."""
-        try:
-            idx = self.TABS.index(self.current_section)
-            new_idx = (idx - 1) % len(self.TABS)
-            self.current_section = self.TABS[new_idx]
-            self._focus_first_command()
-        except ValueError:
-            pass
+        idx = self.TAB_INDEX[self.current_section]
+        self.current_section = self.TABS[(idx - 1) % len(self.TABS)]
+        self._focus_first_command()
     
     def action_next_tab(self) -> None:
         """Move to next tab."""
-        try:
-            idx = self.TABS.index(self.current_section)
-            new_idx = (idx + 1) % len(self.TABS)
-            self.current_section = self.TABS[new_idx]
-            self._focus_first_command()
-        except ValueError:
-            pass
+        idx = self.TAB_INDEX[self.current_section]
+        self.current_section = self.TABS[(idx + 1) % len(self.TABS)]
+        self._focus_first_command()
     
     def _get_sidebar_buttons(self) -> list:
         """Get all buttons in the current sidebar section."""
-        try:
-            sidebar = self.query_one(f"#sidebar-{self.current_section}")
-            return [b for b in sidebar.query("Button")]
-        except Exception:
-            return []
+        return self._section_buttons.get(self.current_section, [])
     
     def _focus_first_command(self) -> None:
         """Focus the first command button in current section."""
+        # Drop any queued move so it can't override this focus
+        self._pending_focus_index = None
         buttons = self._get_sidebar_buttons()
         if buttons:
             buttons[0].focus()
     
-    def action_prev_cmd(self) -> None:
-        """Move focus to previous command."""
+    def _focused_command_index(self, buttons: list) -> Optional[int]:
+        """Get the index of the focused button within buttons, if it is there."""
+        focused = self.focused
+        if focused is None:
+            return None
+        idx = self._button_index.get(focused.id)
+        if idx is not None and idx < len(buttons) and buttons[idx] is focused:
+            return idx
+        return None
+    
+    def _move_command_focus(self, step: int) -> None:
+        """Move command focus by step, applying it once per refresh."""
         buttons = self._get_sidebar_buttons()
         if not buttons:
             return
         
-        # Find currently focused button
-        focused = self.focused
-        try:
-            idx = buttons.index(focused)
-            new_idx = (idx - 1) % len(buttons)
-            buttons[new_idx].focus()
-        except (ValueError, IndexError):
-            buttons[-1].focus()
+        # Build on a move that has not been applied yet, so held keys
+        # still advance one button per press; a move queued for another
+        # section doesn't count
+        scheduled = (
+            self._pending_focus_index is not None
+            and self._pending_focus_section == self.current_section
+        )
+        current = self._focused_command_index(buttons)
+        idx = self._pending_focus_index if scheduled else current
+        if idx is None:
+            idx = 0 if step > 0 else len(buttons) - 1
+        else:
+            idx = (idx + step) % len(buttons)
+        
+        if not scheduled and idx == current:
+            # Focus would not change (a single-command section)
+            return
+        
+        self._pending_focus_index = idx
+        self._pending_focus_section = self.current_section
+        if not scheduled:
+            self.call_after_refresh(self._apply_pending_focus)
+    
+    def _apply_pending_focus(self) -> None:
+        """Focus the command chosen by the last batch of moves."""
+        idx, self._pending_focus_index = self._pending_focus_index, None
+        if idx is None or self._pending_focus_section != self.current_section:
+            return
+        buttons = self._get_sidebar_buttons()
+        if idx < len(buttons):
+            buttons[idx].focus()
+    
+    def action_prev_cmd(self) -> None:
+        """Move focus to previous command."""
+        self._move_command_focus(-1)
     
     def action_next_cmd(self) -> None:
         """Move focus to next command."""
-        buttons = self._get_sidebar_buttons()
-        if not buttons:
-            return
-        
-        # Find currently focused button
-        focused = self.focused
-        try:
-            idx = buttons.index(focused)
-            new_idx = (idx + 1) % len(buttons)
-            buttons[new_idx].focus()
-        except (ValueError, IndexError):
-            buttons[0].focus()
+        self._move_command_focus(1)
     
     def action_run_focused(self) -> None:
         """Run the currently focused command."""
@@ -771,71 +929,35 @@ class SysManage(App):
     
     def action_copy_output(self) -> None:
         """Copy current output panel content to clipboard."""
-        # Map sections to their output widget IDs
-        output_map = {
-            "system": "system-output",
-            "nixos": "nixos-output",
-            "docker": "docker-output",
-            "logs": "log-output",
-            "git": "git-output",
-            "network": "network-output",
-            "services": "services-output",
-            "storage": "storage-output",
-        }
-        
-        output_id = output_map.get(self.current_section)
-        if not output_id:
+        log = self._section_logs[self.current_section]
+        if not log.lines:
+            self.notify("Nothing to copy", severity="warning")
             return
         
+        # RichLog keeps rendered Strips; join their plain text in one pass
+        self._pipe_to_clipboard("\n".join([line.text for line in log.lines]))
+    
+    @work(group="clipboard")
+    async def _pipe_to_clipboard(self, text: str) -> None:
+        """Pipe text into the first clipboard tool that accepts it."""
+        data = text.encode()
         try:
-            log = self.query_one(f"#{output_id}", RichLog)
-            # Get all the text content from the log
-            lines = []
-            for line in log.lines:
-                # Extract plain text from the line
-                if hasattr(line, 'text'):
-                    lines.append(line.text)
-                elif hasattr(line, 'plain'):
-                    lines.append(line.plain)
-                else:
-                    lines.append(str(line))
-            
-            text = "\n".join(lines)
-            
-            if text:
-                # Try different clipboard methods
-                try:
-                    # Try wl-copy (Wayland)
-                    process = subprocess.Popen(
-                        ["wl-copy"],
-                        stdin=subprocess.PIPE,
-                        stderr=subprocess.DEVNULL
-                    )
-                    process.communicate(input=text.encode())
-                    if process.returncode == 0:
-                        self.notify("Copied to clipboard!", severity="information")
-                        return
-                except FileNotFoundError:
-                    pass
-                
+            for argv in CLIPBOARD_COMMANDS:
                 try:
-                    # Try xclip (X11)
-                    process = subprocess.Popen(
-                        ["xclip", "-selection", "clipboard"],
-                        stdin=subprocess.PIPE,
-                        stderr=subprocess.DEVNULL
+                    process = await asyncio.create_subprocess_exec(
+                        *argv,
+                        stdin=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL,
                     )
-                    process.communicate(input=text.encode())
-                    if process.returncode == 0:
-                        self.notify("Copied to clipboard!", severity="information")
-                        return
                 except FileNotFoundError:
-                    pass
-                
-                self.notify("No clipboard tool found (need wl-copy or xclip)", severity="error")
-            else:
-                self.notify("Nothing to copy", severity="warning")
-        except Exception as e:
+                    continue
+                await process.communicate(input=data)
+                if process.returncode == 0:
+                    self.notify("Copied to clipboard!", severity="information")
+                    return
+            
+            self.notify("No clipboard tool found (need wl-copy or xclip)", severity="error")
+        except OSError as e:
             self.notify(f"Copy failed: {e}", severity="error")
     
     def action_refresh(self) -> None:
@@ -843,7 +965,11 @@ class SysManage(App):
         if self.current_section == "system":
             self.run_health_check_to_system()
         elif self.current_section == "docker":
-            self.refresh_docker()
+            # A held key repeats far faster than docker can answer
+            now = time.monotonic()
+            if now - self._docker_refreshed_at >= DOCKER_REFRESH_DEBOUNCE:
+                self._docker_refreshed_at = now
+                self.refresh_docker()
     
     def action_cancel_command(self) -> None:
         """Cancel running command."""
@@ -851,7 +977,8 @@ class SysManage(App):
             try:
                 self.running_process.terminate()
                 self.notify("Command cancelled", severity="warning")
-            except Exception:
+            except ProcessLookupError:
+                # The process exited before we got to it
                 pass
     
     # ========================================================================
@@ -882,14 +1009,11 @@ class SysManage(App):
     
     def convert_ansi_to_rich(self, text: str) -> Text:
         """Convert ANSI color codes to Rich Text object."""
-        # Pattern to match ANSI escape sequences
-        ansi_pattern = re.compile(r'\x1b\[([0-9;]*)m')
-        
         result = Text()
         current_style = ""
         last_end = 0
         
-        for match in ansi_pattern.finditer(text):
+        for match in ANSI_ESCAPE_RE.finditer(text):
             # Add text before this match with current style
             if match.start() > last_end:
                 segment = text[last_end:match.start()]
@@ -898,12 +1022,14 @@ class SysManage(App):
                 else:
                     result.append(segment)
             
-            # Update style based on ANSI code
-            code = match.group(1)
-            if code == '0' or code == '':
-                current_style = ""
-            else:
-                current_style = self.ANSI_TO_RICH.get(code, "")
+            # Update style based on ANSI code; other escapes (cursor
+            # movement, line erase, titles, ...) are just dropped
+            if match.group(2) == 'm':
+                code = match.group(1)
+                if code == '0' or code == '':
+                    current_style = ""
+                else:
+                    current_style = self.ANSI_TO_RICH.get(code, "")
             
             last_end = match.end()
         
@@ -915,12 +1041,12 @@ class SysManage(App):
             else:
                 result.append(segment)
         
-        return result if result.plain else Text(text)
+        return result
     
     @work(exclusive=True, thread=False)
     async def run_command(self, command: str, output_id: str, title: str = "") -> None:
         """Run a command and stream output to a RichLog widget."""
-        log = self.query_one(f"#{output_id}", RichLog)
+        log = self._output_logs[output_id]
         log.clear()
         
         # Store original subtitle
@@ -928,84 +1054,164 @@ class SysManage(App):
         display_title = title if title else "Command"
         
         if title:
-            log.write(Text(f"▶ {title}", style="bold cyan"))
-            log.write(Text(f"$ {command}", style="dim"))
-            log.write("")
+            # One write for the whole header: title, command and a blank line
+            log.write(Text.assemble((f"▶ {title}", "bold cyan"), "\n", (f"$ {command}", "dim"), "\n"))
         
         # Start spinner animation
-        spinner_frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        self.is_running = True
-        status_line_id = f"status-{output_id}"
+        # The status text only depends on the frame, so build each one once
+        status_frames = itertools.cycle([f"{spinner_char} Running: {display_title}..." for spinner_char in SPINNER_FRAMES])
+        
+        def advance_spinner() -> None:
+            """Show the next spinner frame while the command is running."""
+            # Update subtitle in header (appears below title at top of screen)
+            self.sub_title = next(status_frames)
         
-        async def update_spinner():
-            """Update spinner animation while command is running."""
-            frame = 0
-            while self.is_running:
-                spinner_char = spinner_frames[frame]
-                status_text = f"{spinner_char} Running: {display_title}..."
-                # Update subtitle in header (appears below title at top of screen)
-                self.sub_title = status_text
-                frame = (frame + 1) % len(spinner_frames)
-                await asyncio.sleep(0.15)
+        # Output lines are buffered and written to the log in batches, so a
+        # chatty command costs one log refresh per frame rather than per line
+        pending: list[Text] = []
         
+        def flush_output() -> None:
+            """Write buffered output lines to the log in one batch."""
+            if pending:
+                log.write(Text("\n").join(pending))
+                pending.clear()
+        
+        flush_timer = self.set_interval(OUTPUT_FLUSH_INTERVAL, flush_output)
+        
+        process = None
+        spinner_timer = None
         try:
-            self.running_process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT,
-            )
+            if SHELL_SYNTAX_RE.search(command):
+                process = await asyncio.create_subprocess_shell(
+                    command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                )
+            else:
+                # Plain "program arg arg" commands don't need an intermediate shell
+                program, *args = command.split()
+                process = await asyncio.create_subprocess_exec(
+                    resolve_program(program),
+                    *args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                )
+            self.running_process = process
             
-            # Start spinner animation task after process is created
-            self.spinner_task = asyncio.create_task(update_spinner())
+            # Start spinner animation after process is created
+            advance_spinner()
+            spinner_timer = self.set_interval(SPINNER_INTERVAL, advance_spinner)
             
+            stdout = process.stdout
+            # Pieces of an unterminated last line, joined once it ends
+            partial: list[bytes] = []
+            partial_size = 0
             while True:
-                line = await self.running_process.stdout.readline()
-                if not line:
+                chunk = await stdout.read(OUTPUT_READ_SIZE)
+                if chunk:
+                    # Hold back an unterminated last line until the rest arrives
+                    head, newline, tail = chunk.rpartition(b"\n")
+                    if newline:
+                        partial.append(head)
+                        complete = b"".join(partial)
+                        partial = [tail] if tail else []
+                        partial_size = len(tail)
+                    else:
+                        # A carriage return redraws the line (progress bars),
+                        # so only the text after the last one is still shown
+                        _, cr, redrawn = chunk.rpartition(b"\r")
+                        if cr and redrawn:
+                            partial = [redrawn]
+                            partial_size = len(redrawn)
+                        else:
+                            partial.append(chunk)
+                            partial_size += len(chunk)
+                        if partial_size < OUTPUT_MAX_PARTIAL:
+                            continue
+                        # Don't buffer an endless line; show what there is
+                        complete = b"".join(partial)
+                        partial = []
+                        partial_size = 0
+                elif partial:
+                    # Output ended without a trailing newline
+                    complete = b"".join(partial)
+                    partial = []
+                else:
                     break
-                text = line.decode('utf-8', errors='replace').rstrip()
                 
-                # Check if line contains ANSI codes
-                if '\x1b[' in text:
-                    log.write(self.convert_ansi_to_rich(text))
-                # Apply semantic coloring for lines without ANSI codes
-                elif any(x in text.lower() for x in ['error', 'failed', 'failure', '✗']):
-                    log.write(Text(text, style="red"))
-                elif any(x in text.lower() for x in ['warning', 'warn', '⚠']):
-                    log.write(Text(text, style="yellow"))
-                elif any(x in text.lower() for x in ['success', '✓', 'done', 'ok ']):
-                    log.write(Text(text, style="green"))
-                elif text.startswith('===') or text.startswith('---') or text.startswith('╔') or text.startswith('║') or text.startswith('╚'):
-                    log.write(Text(text, style="bold magenta"))
-                else:
-                    log.write(text)
+                # Decode all complete lines of the chunk in one call
+                decoded = complete.decode('utf-8', errors='replace')
+                # One scan of the chunk spares clean output a per-line check
+                has_escapes = '\x1b' in decoded
+                for text in decoded.split('\n'):
+                    text = text.rstrip()
+                    
+                    # Check if line contains ANSI codes
+                    if has_escapes and '\x1b' in text:
+                        pending.append(self.convert_ansi_to_rich(text))
+                    # Apply semantic coloring for lines without ANSI codes
+                    elif not KEYWORD_LINE_RE.search(text):
+                        if text.startswith(HEADER_LINE_PREFIXES):
+                            pending.append(Text(text, style="bold magenta"))
+                        else:
+                            pending.append(log.highlighter(text))
+                    elif ERROR_LINE_RE.search(text):
+                        pending.append(Text(text, style="red"))
+                    elif WARNING_LINE_RE.search(text):
+                        pending.append(Text(text, style="yellow"))
+                    else:
+                        pending.append(Text(text, style="green"))
+                
+                # Reads from an already-filled pipe buffer never suspend, so
+                # on a burst flush by size and let the UI have a turn
+                if len(pending) >= OUTPUT_FLUSH_LINES:
+                    flush_output()
+                    await asyncio.sleep(0)
             
-            await self.running_process.wait()
+            await process.wait()
+            flush_output()
             
-            if self.running_process.returncode == 0:
-                log.write("")
-                log.write(Text("✓ Command completed successfully", style="bold green"))
+            if process.returncode == 0:
+                log.write(COMMAND_SUCCEEDED)
             else:
-                log.write("")
-                log.write(Text(f"✗ Command exited with code {self.running_process.returncode}", style="bold red"))
+                log.write(Text(f"\n✗ Command exited with code {process.returncode}", style="bold red"))
         
         except asyncio.CancelledError:
-            log.write(Text("\n⚠ Command cancelled", style="bold yellow"))
+            # Starting another command cancels this worker; stop the old
+            # process too rather than leaving it running in the background
+            if process is not None and process.returncode is None:
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
+            flush_output()
+            log.write(COMMAND_CANCELLED)
+        except OSError as e:
+            # The program could not be started (missing, not executable, ...)
+            flush_output()
+            log.write(Text(f"\n✗ Could not run command: {e}", style="bold red"))
         except Exception as e:
+            flush_output()
             log.write(Text(f"\n✗ Error: {e}", style="bold red"))
         finally:
+            flush_timer.stop()
+            
             # Stop spinner animation
-            self.is_running = False
-            if self.spinner_task:
-                self.spinner_task.cancel()
-                try:
-                    await self.spinner_task
-                except asyncio.CancelledError:
-                    pass
-                self.spinner_task = None
+            if spinner_timer is not None:
+                spinner_timer.stop()
             
             # Restore original subtitle
             self.sub_title = original_subtitle
-            self.running_process = None
+            # A replacement command may already have registered its process
+            if self.running_process is process:
+                self.running_process = None
+    
+    @on(Button.Pressed, "#sidebar Button")
+    def run_button_command(self, event: Button.Pressed) -> None:
+        """Run the shell command bound to a sidebar button, if it has one."""
+        entry = BUTTON_COMMANDS.get(event.button.id)
+        if entry is not None:
+            self.run_command(entry.command, entry.output_id, entry.title)
     
     # ========================================================================
     # Health Check (in System section)
@@ -1013,9 +1219,8 @@ class SysManage(App):
     
     def run_health_check_to_system(self) -> None:
         """Run full health check to system output."""
-        script_path = DOTFILES_PATH / "scripts" / "check-system-health.sh"
-        if script_path.exists():
-            self.run_command(f"bash {script_path}", "system-output", "System Health Check")
+        if HEALTH_CHECK_SCRIPT.exists():
+            self.run_command(f"bash {HEALTH_CHECK_SCRIPT}", "system-output", "System Health Check")
         else:
             self.run_quick_health_check_to_system()
     
@@ -1026,58 +1231,12 @@ class SysManage(App):
     
     def run_quick_health_check_to_system(self) -> None:
         """Run quick health check to system output."""
-        commands = """
-echo "=== Quick Health Check ==="
-echo ""
-echo "📍 Hostname: $(hostname)"
-echo "🕐 Uptime: $(uptime -p)"
-echo ""
-echo "=== Services ==="
-systemctl is-active --quiet docker && echo "✓ Docker: Running" || echo "✗ Docker: Not running"
-systemctl is-active --quiet sshd && echo "✓ SSH: Running" || echo "✗ SSH: Not running"
-systemctl is-active --quiet tailscaled && echo "✓ Tailscale: Running" || echo "✗ Tailscale: Not running"
-systemctl is-active --quiet NetworkManager && echo "✓ NetworkManager: Running" || echo "✗ NetworkManager: Not running"
-echo ""
-echo "=== Disk Space ==="
-df -h / /home /nix 2>/dev/null | tail -n +2
-echo ""
-echo "=== Memory ==="
-free -h | head -2
-echo ""
-echo "=== Failed Services ==="
-systemctl list-units --state=failed --no-legend | head -5 || echo "None"
-"""
-        self.run_command(commands, "system-output", "Quick Health Check")
-    
-    @on(Button.Pressed, "#btn-health-quick")
-    def run_quick_health_check(self) -> None:
-        """Run quick health check."""
-        self.run_quick_health_check_to_system()
+        self.run_command(QUICK_HEALTH_SCRIPT, "system-output", "Quick Health Check")
     
     # ========================================================================
     # NixOS Management
     # ========================================================================
     
-    @on(Button.Pressed, "#btn-nix-switch")
-    def nix_switch(self) -> None:
-        self.run_command(NIXOS_COMMANDS["switch"], "nixos-output", "NixOS Rebuild Switch")
-    
-    @on(Button.Pressed, "#btn-nix-test")
-    def nix_test(self) -> None:
-        self.run_command(NIXOS_COMMANDS["test"], "nixos-output", "NixOS Rebuild Test")
-    
-    @on(Button.Pressed, "#btn-nix-build")
-    def nix_build(self) -> None:
-        self.run_command(NIXOS_COMMANDS["build"], "nixos-output", "NixOS Rebuild Build")
-    
-    @on(Button.Pressed, "#btn-nix-boot")
-    def nix_boot(self) -> None:
-        self.run_command(NIXOS_COMMANDS["boot"], "nixos-output", "NixOS Rebuild Boot")
-    
-    @on(Button.Pressed, "#btn-nix-update")
-    def nix_update(self) -> None:
-        self.run_command(NIXOS_COMMANDS["update"], "nixos-output", "Update Flake Inputs")
-    
     @on(Button.Pressed, "#btn-nix-gc")
     @work
     async def nix_gc(self) -> None:
@@ -1086,10 +1245,6 @@ systemctl list-units --state=failed --no-legend | head -5 || echo "None"
         ):
             self.run_command(NIXOS_COMMANDS["gc"], "nixos-output", "Garbage Collection")
     
-    @on(Button.Pressed, "#btn-nix-optimise")
-    def nix_optimise(self) -> None:
-        self.run_command(NIXOS_COMMANDS["optimise"], "nixos-output", "Optimise Nix Store")
-    
     @on(Button.Pressed, "#btn-nix-generations")
     def nix_generations(self) -> None:
         cmd = r'''
@@ -1139,193 +1294,76 @@ done | tac | tac
 '''
         self.run_command(cmd, "nixos-output", "NixOS Generations")
     
-    @on(Button.Pressed, "#btn-nix-machines")
-    def nix_machines(self) -> None:
-        cmd = r'''
-echo "══════════════════════════════════════════════════════════════"
-echo "                    NIXOS MACHINES STATUS"
-echo "══════════════════════════════════════════════════════════════"
-echo ""
-
-# Helper function to get uptime reliably
-get_uptime() {
-    if uptime -p 2>/dev/null; then
-        return 0
-    fi
-    # Fallback: parse /proc/uptime
-    if [ -r /proc/uptime ]; then
-        read -r sec _ < /proc/uptime
-        sec=${sec%%.*}
-        d=$((sec/86400))
-        h=$(((sec%86400)/3600))
-        m=$(((sec%3600)/60))
-        printf "up %d days, %d hours, %d minutes" "$d" "$h" "$m"
-        return 0
-    fi
-    echo "unknown"
-}
-
-CURRENT_HOST=$(hostname)
-
-for machine in brian-laptop superheavy backup docker; do
-    echo "┌─────────────────────────────────────────────────────────────"
-    echo "│ 🖥️  $machine"
-    echo "├─────────────────────────────────────────────────────────────"
-    
-    if [ "$machine" = "$CURRENT_HOST" ]; then
-        VERSION=$(nixos-version 2>/dev/null || echo "unknown")
-        KERNEL=$(uname -r)
-        UPTIME=$(get_uptime)
-        LAST_CHANGE=$(stat -c %y /run/current-system 2>/dev/null | cut -d. -f1 || echo "unknown")
-        GEN=$(readlink /nix/var/nix/profiles/system 2>/dev/null | grep -oE "[0-9]+" | tail -1 || echo "?")
-        
-        echo "│  Status:      ✓ Local (this machine)"
-        echo "│  NixOS:       $VERSION"
-        echo "│  Kernel:      $KERNEL"
-        echo "│  Generation:  $GEN"
-        echo "│  Last Switch: $LAST_CHANGE"
-        echo "│  Uptime:      $UPTIME"
-    else
-        # Try multiple connection methods with fallback
-        REACHABLE=false
-        SSH_AUTH_OK=false
-        MACHINE_TARGET=""
-        SSH_OPTS="-o ConnectTimeout=5 -o StrictHostKeyChecking=no -o BatchMode=yes"
-        
-        # First, find the machine's IP address via multiple methods
-        MACHINE_IP=""
-        HOSTNAME_REACHABLE=false
-        
-        # Check if hostname is reachable via ping (like health check)
-        if ping -c 1 -W 2 "$machine" &>/dev/null 2>&1; then
-            HOSTNAME_REACHABLE=true
-        fi
-        
-        # Method 1: Try to get Tailscale IP
-        if command -v tailscale &>/dev/null; then
-            MACHINE_IP=$(tailscale ip -4 "$machine" 2>/dev/null | head -1)
-        fi
-        
-        # Method 2: Try hostname resolution
-        if [ -z "$MACHINE_IP" ]; then
-            RESOLVED=$(getent hosts "$machine" 2>/dev/null | awk '{print $1}' | head -1)
-            if [ -n "$RESOLVED" ]; then
-                MACHINE_IP="$RESOLVED"
-            fi
-        fi
-        
-        # Check if SSH port is reachable (like health check does)
-        PORT_REACHABLE=false
-        if [ -n "$MACHINE_IP" ]; then
-            if timeout 2 bash -c "echo > /dev/tcp/$MACHINE_IP/22" 2>/dev/null; then
-                PORT_REACHABLE=true
-            fi
-        fi
-        
-        # Now try SSH authentication with different targets
-        # Try hostname first if ping works (even if we don't have IP yet)
-        if [ "$HOSTNAME_REACHABLE" = true ] || [ "$PORT_REACHABLE" = true ] || [ -n "$MACHINE_IP" ]; then
-            # Build list of targets to try, prioritizing hostname if ping works
-            TARGETS=()
-            if [ "$HOSTNAME_REACHABLE" = true ]; then
-                TARGETS+=("brian@$machine" "$machine")
-            fi
-            if [ -n "$MACHINE_IP" ]; then
-                TARGETS+=("brian@$MACHINE_IP" "$MACHINE_IP")
-            fi
-            
-            # Try each target
-            for target in "${TARGETS[@]}"; do
-                if ssh $SSH_OPTS "$target" echo ok >/dev/null 2>&1; then
-                    REACHABLE=true
-                    SSH_AUTH_OK=true
-                    MACHINE_TARGET="$target"
-                    break
-                fi
-            done
-        fi
-        
-        if [ "$SSH_AUTH_OK" = true ]; then
-            # SSH authentication successful - get system info
-            VERSION=$(ssh $SSH_OPTS "$MACHINE_TARGET" nixos-version 2>/dev/null || echo "unknown")
-            KERNEL=$(ssh $SSH_OPTS "$MACHINE_TARGET" uname -r 2>/dev/null || echo "unknown")
-            UPTIME=$(ssh $SSH_OPTS "$MACHINE_TARGET" "$(declare -f get_uptime); get_uptime" 2>/dev/null || echo "unknown")
-            LAST_CHANGE=$(ssh $SSH_OPTS "$MACHINE_TARGET" 'stat -c %y /run/current-system 2>/dev/null | cut -d. -f1' || echo "unknown")
-            GEN=$(ssh $SSH_OPTS "$MACHINE_TARGET" 'readlink /nix/var/nix/profiles/system | grep -oE "[0-9]+" | tail -1' 2>/dev/null || echo "?")
-            
-            echo "│  Status:      ✓ Online"
-            echo "│  NixOS:       $VERSION"
-            echo "│  Kernel:      $KERNEL"
-            echo "│  Generation:  $GEN"
-            echo "│  Last Switch: $LAST_CHANGE"
-            echo "│  Uptime:      $UPTIME"
-        elif [ "$HOSTNAME_REACHABLE" = true ] || [ "$PORT_REACHABLE" = true ]; then
-            # Machine is reachable but SSH auth failed
-            echo "│  Status:      ⚠ Reachable but SSH auth failed"
-            echo "│  Note:        Machine is online but SSH keys not configured"
-            if [ "$HOSTNAME_REACHABLE" = true ]; then
-                echo "│  Network:     Hostname ping works"
-            fi
-            if [ -n "$MACHINE_IP" ]; then
-                echo "│  IP:          $MACHINE_IP"
-            fi
-        else
-            # Can't reach machine at all
-            echo "│  Status:      ✗ Offline or unreachable"
-            if [ -n "$MACHINE_IP" ]; then
-                echo "│  IP:          $MACHINE_IP (but SSH port not reachable)"
-            fi
-        fi
-    fi
-    echo "└─────────────────────────────────────────────────────────────"
-    echo ""
-done
-'''
-        self.run_command(cmd, "nixos-output", "NixOS Machines")
-    
     # ========================================================================
     # Docker Management
     # ========================================================================
     
-    @work(thread=True)
-    def refresh_docker(self) -> None:
+    @work(exclusive=True, group="docker")
+    async def refresh_docker(self) -> None:
         """Refresh docker containers list."""
+        if not _docker_cli_installed():
+            self.notify("Docker is not installed", severity="warning")
+            return
+        
         try:
-            # Get containers
-            result = subprocess.run(
-                ["docker", "ps", "-a", "--format", "{{.Names}}|{{.Status}}|{{.Image}}"],
-                capture_output=True, text=True, timeout=10
-            )
-            
-            # Update option list
-            def update_ui():
-                option_list = self.query_one("#docker-containers", OptionList)
-                option_list.clear_options()
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    for line in result.stdout.strip().split('\n'):
-                        parts = line.split('|')
-                        if len(parts) >= 3:
-                            name, status, image = parts[0], parts[1], parts[2]
-                            # Color based on status
-                            if 'Up' in status:
-                                status_icon = "🟢"
-                            elif 'Exited' in status:
-                                status_icon = "🔴"
-                            else:
-                                status_icon = "🟡"
-                            option_list.add_option(Option(f"{status_icon} {name} ({image[:30]})", id=name))
-                else:
-                    option_list.add_option(Option("No containers found"))
+            if not await self._list_docker_containers():
+                return
+        except OSError as e:
+            self.notify(f"Error: {e}", severity="error")
+            return
+        
+        # Also show full info in output
+        self.run_command(DOCKER_COMMANDS["ps"], "docker-output", "Docker Containers")
+    
+    async def _list_docker_containers(self) -> bool:
+        """Rebuild the container list from docker ps; False if it timed out."""
+        # Get containers (stderr is never shown, so don't pipe it)
+        process = await asyncio.create_subprocess_exec(
+            resolve_program("docker"), "ps", "-a", "--format", "{{.Names}}|{{.Status}}|{{.Image}}",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(), timeout=10)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            self.notify("Timed out listing docker containers", severity="error")
+            return False
+        except asyncio.CancelledError:
+            # A newer refresh replaced this one; don't leave docker ps behind
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        
+        # Only decode the listing when there is something to show
+        output = output.strip()
+        lines = output.decode('utf-8', errors='replace').split('\n') if process.returncode == 0 and output else []
+        containers = [c for c in map(DockerContainer.parse, lines) if c is not None]
+        
+        # Leave the list (and its highlight) alone if nothing changed
+        if containers != self._docker_containers:
+            self._docker_containers = containers
             
-            self.call_from_thread(update_ui)
+            option_list = self._docker_list
+            option_list.clear_options()
             
-            # Also show full info in output
-            self.call_from_thread(
-                lambda: self.run_command(DOCKER_COMMANDS["ps"], "docker-output", "Docker Containers")
-            )
-        except Exception as e:
-            self.call_from_thread(lambda: self.notify(f"Error: {e}", severity="error"))
+            if containers:
+                for container in containers:
+                    # Color based on status
+                    if 'Up' in container.status:
+                        status_icon = "🟢"
+                    elif 'Exited' in container.status:
+                        status_icon = "🔴"
+                    else:
+                        status_icon = "🟡"
+                    # Plain Text prompts skip the console markup parser
+                    prompt = Text.assemble(status_icon, " ", container.name, f" ({container.image[:30]})")
+                    option_list.add_option(Option(prompt, id=container.name))
+            else:
+                option_list.add_option(Option("No containers found"))
+        return True
     
     @on(Button.Pressed, "#btn-docker-refresh")
     def docker_refresh(self) -> None:
@@ -1349,36 +1387,23 @@ done
     
     def get_selected_container(self) -> Optional[str]:
         """Get currently selected container name."""
-        option_list = self.query_one("#docker-containers", OptionList)
+        option_list = self._docker_list
         if option_list.highlighted is not None:
             option = option_list.get_option_at_index(option_list.highlighted)
             if option and option.id:
                 return str(option.id)
         return None
     
-    @on(Button.Pressed, "#btn-container-start")
-    def container_start(self) -> None:
-        container = self.get_selected_container()
-        if container:
-            self.run_command(f"docker start {container}", "docker-output", f"Starting {container}")
-    
-    @on(Button.Pressed, "#btn-container-stop")
-    def container_stop(self) -> None:
-        container = self.get_selected_container()
-        if container:
-            self.run_command(f"docker stop {container}", "docker-output", f"Stopping {container}")
-    
-    @on(Button.Pressed, "#btn-container-restart")
-    def container_restart(self) -> None:
-        container = self.get_selected_container()
-        if container:
-            self.run_command(f"docker restart {container}", "docker-output", f"Restarting {container}")
-    
-    @on(Button.Pressed, "#btn-container-logs")
-    def container_logs(self) -> None:
+    @on(Button.Pressed, "#sidebar-docker Button")
+    def container_command(self, event: Button.Pressed) -> None:
+        """Run the command bound to a container button on the selected container."""
+        entry = CONTAINER_COMMANDS.get(event.button.id)
+        if entry is None:
+            return
         container = self.get_selected_container()
         if container:
-            self.run_command(f"docker logs -f --tail 100 {container}", "docker-output", f"Logs: {container}")
+            command, title = entry
+            self.run_command(command.format(container=container), "docker-output", title.format(container=container))
     
     @on(Button.Pressed, "#btn-container-remove")
     @work
@@ -1391,136 +1416,9 @@ done
                 self.run_command(f"docker rm -f {container}", "docker-output", f"Removing {container}")
     
     # ========================================================================
-    # Log Viewer
-    # ========================================================================
-    
-    @on(Button.Pressed, "#btn-log-system")
-    def log_system(self) -> None:
-        self.run_command(LOG_COMMANDS["system"], "log-output", "System Logs")
-    
-    @on(Button.Pressed, "#btn-log-kernel")
-    def log_kernel(self) -> None:
-        self.run_command(LOG_COMMANDS["kernel"], "log-output", "Kernel Logs")
-    
-    @on(Button.Pressed, "#btn-log-docker")
-    def log_docker(self) -> None:
-        self.run_command(LOG_COMMANDS["docker"], "log-output", "Docker Logs")
-    
-    @on(Button.Pressed, "#btn-log-nginx")
-    def log_nginx(self) -> None:
-        self.run_command(LOG_COMMANDS["nginx"], "log-output", "Nginx Logs")
-    
-    @on(Button.Pressed, "#btn-log-sshd")
-    def log_sshd(self) -> None:
-        self.run_command(LOG_COMMANDS["sshd"], "log-output", "SSH Logs")
-    
-    @on(Button.Pressed, "#btn-log-tailscale")
-    def log_tailscale(self) -> None:
-        self.run_command(LOG_COMMANDS["tailscale"], "log-output", "Tailscale Logs")
-    
-    @on(Button.Pressed, "#btn-log-boot")
-    def log_boot(self) -> None:
-        self.run_command(LOG_COMMANDS["boot"], "log-output", "Boot Logs")
-    
-    # ========================================================================
-    # System Info
+    # System Power
     # ========================================================================
     
-    @on(Button.Pressed, "#btn-sys-refresh")
-    def refresh_system_info(self) -> None:
-        """Show comprehensive system info."""
-        commands = f"""
-echo "╔══════════════════════════════════════════════════════════════╗"
-echo "║               SYSTEM INFORMATION                              ║"
-echo "╚══════════════════════════════════════════════════════════════╝"
-echo ""
-echo "🖥️  Hostname: $(hostname)"
-echo "🐧 Kernel: $(uname -r)"
-echo "⏱️  Uptime: $(uptime -p)"
-echo "📅 Date: $(date)"
-echo ""
-echo "═══════════════════════ CPU ═══════════════════════"
-lscpu | grep -E "Model name|CPU\\(s\\)|Thread|Core|MHz" | head -5
-echo ""
-echo "═══════════════════════ MEMORY ═══════════════════════"
-free -h
-echo ""
-echo "═══════════════════════ DISK ═══════════════════════"
-df -h | grep -E "^/dev|Filesystem"
-echo ""
-echo "═══════════════════════ NIXOS ═══════════════════════"
-nixos-version 2>/dev/null || echo "Not a NixOS system"
-echo "Flake: {DOTFILES_PATH}"
-echo ""
-echo "═══════════════════════ NETWORK ═══════════════════════"
-ip -brief addr | grep -v "^lo"
-"""
-        self.run_command(commands, "system-output", "System Information")
-    
-    @on(Button.Pressed, "#btn-sys-disk")
-    def sys_disk(self) -> None:
-        commands = """
-echo "═══════════════════════ DISK USAGE ═══════════════════════"
-echo ""
-df -h
-echo ""
-echo "═══════════════════════ LARGEST DIRECTORIES ═══════════════════════"
-echo ""
-du -sh /nix/store 2>/dev/null || true
-du -sh /home/* 2>/dev/null | sort -rh | head -10
-echo ""
-echo "═══════════════════════ NIX STORE ═══════════════════════"
-nix-store --gc --print-dead 2>/dev/null | wc -l | xargs echo "Dead paths:"
-"""
-        self.run_command(commands, "system-output", "Disk Usage")
-    
-    @on(Button.Pressed, "#btn-sys-memory")
-    def sys_memory(self) -> None:
-        commands = """
-echo "═══════════════════════ MEMORY USAGE ═══════════════════════"
-echo ""
-free -h
-echo ""
-echo "═══════════════════════ TOP MEMORY CONSUMERS ═══════════════════════"
-echo ""
-ps aux --sort=-%mem | head -15
-"""
-        self.run_command(commands, "system-output", "Memory Usage")
-    
-    @on(Button.Pressed, "#btn-sys-network")
-    def sys_network(self) -> None:
-        commands = """
-echo "═══════════════════════ NETWORK INTERFACES ═══════════════════════"
-echo ""
-ip -brief addr
-echo ""
-echo "═══════════════════════ ROUTING TABLE ═══════════════════════"
-echo ""
-ip route
-echo ""
-echo "═══════════════════════ TAILSCALE STATUS ═══════════════════════"
-echo ""
-tailscale status 2>/dev/null || echo "Tailscale not available"
-echo ""
-echo "═══════════════════════ LISTENING PORTS ═══════════════════════"
-echo ""
-ss -tlnp 2>/dev/null | head -20
-"""
-        self.run_command(commands, "system-output", "Network Info")
-    
-    @on(Button.Pressed, "#btn-sys-processes")
-    def sys_processes(self) -> None:
-        commands = """
-echo "═══════════════════════ TOP PROCESSES (CPU) ═══════════════════════"
-echo ""
-ps aux --sort=-%cpu | head -15
-echo ""
-echo "═══════════════════════ SYSTEMD SERVICES ═══════════════════════"
-echo ""
-systemctl list-units --type=service --state=running | head -20
-"""
-        self.run_command(commands, "system-output", "Processes")
-    
     @on(Button.Pressed, "#btn-sys-reboot")
     @work
     async def sys_reboot(self) -> None:
@@ -1536,122 +1434,6 @@ systemctl list-units --type=service --state=running | head -20
             ConfirmDialog("Shutdown System", "Are you sure you want to shut down?")
         ):
             self.run_command("sudo systemctl poweroff", "system-output", "Shutting down...")
-    
-    # ========================================================================
-    # Git Commands
-    # ========================================================================
-    
-    @on(Button.Pressed, "#btn-git-status")
-    def git_status(self) -> None:
-        self.run_command(f"cd {DOTFILES_PATH} && git status", "git-output", "Git Status")
-    
-    @on(Button.Pressed, "#btn-git-log")
-    def git_log(self) -> None:
-        self.run_command(f"cd {DOTFILES_PATH} && git log --oneline --graph -20", "git-output", "Git Log")
-    
-    @on(Button.Pressed, "#btn-git-diff")
-    def git_diff(self) -> None:
-        self.run_command(f"cd {DOTFILES_PATH} && git diff", "git-output", "Git Diff")
-    
-    @on(Button.Pressed, "#btn-git-branches")
-    def git_branches(self) -> None:
-        self.run_command(f"cd {DOTFILES_PATH} && git branch -a", "git-output", "Git Branches")
-    
-    @on(Button.Pressed, "#btn-git-pull")
-    def git_pull(self) -> None:
-        self.run_command(f"cd {DOTFILES_PATH} && git pull", "git-output", "Git Pull")
-    
-    @on(Button.Pressed, "#btn-git-push")
-    def git_push(self) -> None:
-        self.run_command(f"cd {DOTFILES_PATH} && git push", "git-output", "Git Push")
-    
-    @on(Button.Pressed, "#btn-git-fetch")
-    def git_fetch(self) -> None:
-        self.run_command(f"cd {DOTFILES_PATH} && git fetch --all", "git-output", "Git Fetch")
-    
-    # ========================================================================
-    # Network Commands
-    # ========================================================================
-    
-    @on(Button.Pressed, "#btn-net-interfaces")
-    def net_interfaces(self) -> None:
-        self.run_command("ip -c addr", "network-output", "Network Interfaces")
-    
-    @on(Button.Pressed, "#btn-net-connections")
-    def net_connections(self) -> None:
-        self.run_command("ss -tunapl 2>/dev/null | head -50", "network-output", "Active Connections")
-    
-    @on(Button.Pressed, "#btn-net-ports")
-    def net_ports(self) -> None:
-        self.run_command("ss -tlnp", "network-output", "Listening Ports")
-    
-    @on(Button.Pressed, "#btn-net-dns")
-    def net_dns(self) -> None:
-        self.run_command("cat /etc/resolv.conf && echo '' && resolvectl status 2>/dev/null | head -30", "network-output", "DNS Configuration")
-    
-    @on(Button.Pressed, "#btn-net-ping")
-    def net_ping(self) -> None:
-        self.run_command("ping -c 5 8.8.8.8 && ping -c 5 google.com", "network-output", "Ping Test")
-    
-    @on(Button.Pressed, "#btn-net-speedtest")
-    def net_speedtest(self) -> None:
-        self.run_command("speedtest-cli --simple", "network-output", "Speed Test")
-    
-    @on(Button.Pressed, "#btn-net-tailscale")
-    def net_tailscale(self) -> None:
-        self.run_command("tailscale status && echo '' && tailscale ip", "network-output", "Tailscale Status")
-    
-    # ========================================================================
-    # Services Commands
-    # ========================================================================
-    
-    @on(Button.Pressed, "#btn-svc-running")
-    def svc_running(self) -> None:
-        self.run_command("systemctl list-units --type=service --state=running", "services-output", "Running Services")
-    
-    @on(Button.Pressed, "#btn-svc-failed")
-    def svc_failed(self) -> None:
-        self.run_command("systemctl list-units --state=failed", "services-output", "Failed Services")
-    
-    @on(Button.Pressed, "#btn-svc-all")
-    def svc_all(self) -> None:
-        self.run_command("systemctl list-units --type=service", "services-output", "All Services")
-    
-    @on(Button.Pressed, "#btn-svc-timers")
-    def svc_timers(self) -> None:
-        self.run_command("systemctl list-timers --all", "services-output", "Timers")
-    
-    @on(Button.Pressed, "#btn-svc-reload")
-    def svc_reload(self) -> None:
-        self.run_command("sudo systemctl daemon-reload", "services-output", "Daemon Reload")
-    
-    # ========================================================================
-    # Storage Commands
-    # ========================================================================
-    
-    @on(Button.Pressed, "#btn-stor-df")
-    def stor_df(self) -> None:
-        self.run_command("df -h", "storage-output", "Disk Usage")
-    
-    @on(Button.Pressed, "#btn-stor-lsblk")
-    def stor_lsblk(self) -> None:
-        self.run_command("lsblk -o NAME,SIZE,TYPE,FSTYPE,MOUNTPOINT,LABEL", "storage-output", "Block Devices")
-    
-    @on(Button.Pressed, "#btn-stor-mounts")
-    def stor_mounts(self) -> None:
-        self.run_command("findmnt -t notmpfs,nosquashfs,nodevtmpfs", "storage-output", "Mount Points")
-    
-    @on(Button.Pressed, "#btn-stor-smart")
-    def stor_smart(self) -> None:
-        self.run_command("sudo smartctl -H /dev/sda 2>/dev/null || echo 'SMART not available'; lsblk -d -o NAME,MODEL,SIZE", "storage-output", "SMART Health")
-    
-    @on(Button.Pressed, "#btn-stor-du")
-    def stor_du(self) -> None:
-        self.run_command("du -sh /home/* 2>/dev/null | sort -rh | head -15", "storage-output", "Largest Directories")
-    
-    @on(Button.Pressed, "#btn-stor-nix")
-    def stor_nix(self) -> None:
-        self.run_command("du -sh /nix/store && nix-store --gc --print-dead 2>/dev/null | wc -l | xargs -I{} echo 'Dead paths: {}'", "storage-output", "Nix Store")
 
 
 # ============================================================================